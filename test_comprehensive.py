@@ -5,13 +5,23 @@ Combines all tests from test_all_apis.py, test_aggregations.sh, and test_cardina
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+import socket
+import math
 import json
+import orjson
 import time
 import sys
 from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Any
 import random
 import string
+import uuid
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from colorama import init, Fore, Style
 
 # Initialize colorama for colored output
@@ -19,50 +29,198 @@ init(autoreset=True)
 
 # Configuration
 BASE_URL = "http://localhost:8082/api/v1"
+HEALTH_URL = "http://localhost:8082/actuator/health"
+REGISTER_URL = f"{BASE_URL}/metrics/register"
+INGEST_URL = f"{BASE_URL}/metrics/ingest"
+QUERY_URL = f"{BASE_URL}/metrics/query"
+ARCHIVE_STATS_URL = f"{BASE_URL}/archive/stats"
+ARCHIVE_QUERY_URL = f"{BASE_URL}/archive/query"
 HEADERS = {"Content-Type": "application/json"}
 
+class LowLatencyAdapter(HTTPAdapter):
+    """HTTPAdapter that enables TCP keep-alive on pooled connections"""
+    
+    # urllib3's defaults already set TCP_NODELAY; only SO_KEEPALIVE is added
+    SOCKET_OPTIONS = HTTPConnection.default_socket_options + [
+        (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+    ]
+    
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs["socket_options"] = self.SOCKET_OPTIONS
+        super().init_poolmanager(*args, **kwargs)
+
+# Shared session so every request reuses the same keep-alive connection.
+# All traffic goes to localhost:8082, so a single host pool is enough.
+SESSION = requests.Session()
+SESSION.headers.update(HEADERS)
+SESSION.mount("http://", LowLatencyAdapter(pool_connections=1, pool_maxsize=32, max_retries=0))
+
+# Worker pool for firing independent requests concurrently over SESSION.
+# Sized so the ten aggregation queries plus the archive calls go out in one wave.
+EXECUTOR = ThreadPoolExecutor(max_workers=16)
+
+# Unique per-run prefix for metric names, so reruns never collide
+RUN_ID = uuid.uuid4().hex[:8]
+_name_counter = itertools.count()
+
+# Label sets shared by every row of the ingestion test payloads
+ROOM1_LABELS = {"location": "room1", "sensor_id": "s001"}
+USERS_LABELS = {"endpoint": "/api/users", "status_code": "200"}
+
+# Request bodies for the registration rejection tests, serialized once at import
+INVALID_JSON_BODY = b"invalid json{"
+INCOMPLETE_METRIC_BODY = orjson.dumps({"name": f"incomplete_{RUN_ID}"})  # Missing type
+INVALID_NAME_METRIC_BODY = orjson.dumps({
+    "name": "123-invalid-name!@#",  # Invalid characters
+    "type": "GAUGE",
+    "description": "Test invalid name"
+})
+LONG_NAME_METRIC_BODY = orjson.dumps({
+    "name": "a" * 300,  # Over 255 character limit
+    "type": "GAUGE",
+    "description": "Test long name"
+})
+
+@dataclass
+class Counters:
+    """Pass/fail/skip tallies, safe to update from concurrent test sections"""
+    passed: int = 0
+    failed: int = 0
+    skipped: int = 0
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
 # Test counters
-tests_passed = 0
-tests_failed = 0
-tests_skipped = 0
+COUNTERS = Counters()
+
+# Colored output prefixes, built once
+HEADER_RULE = f"{Fore.CYAN}{'='*60}"
+PASS_MARK = f"{Fore.GREEN}✓{Style.RESET_ALL} "
+FAIL_MARK = f"{Fore.RED}✗{Style.RESET_ALL} "
+SKIP_MARK = f"{Fore.YELLOW}○{Style.RESET_ALL} "
+RUNNING_MARK = f"{Fore.BLUE}⟳{Style.RESET_ALL} "
+
+# Per-thread output buffer used while a test section is running
+_output = threading.local()
+
+def emit(line: str = ""):
+    """Print a line, or buffer it when running inside a test section"""
+    lines = getattr(_output, "lines", None)
+    if lines is None:
+        print(line)
+    else:
+        lines.append(line)
+
+def write_lines(lines: List[str]):
+    """Write buffered lines to stdout in a single call"""
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
 
 def print_header(title: str):
     """Print a section header"""
-    print(f"\n{Fore.CYAN}{'='*60}")
-    print(f"{Fore.CYAN}{title}")
-    print(f"{Fore.CYAN}{'='*60}{Style.RESET_ALL}")
+    emit(f"\n{HEADER_RULE}")
+    emit(f"{Fore.CYAN}{title}")
+    emit(f"{HEADER_RULE}{Style.RESET_ALL}")
 
 def print_test(name: str, status: str = "RUNNING"):
     """Print test status"""
     if status == "PASS":
-        print(f"{Fore.GREEN}✓{Style.RESET_ALL} {name}")
+        emit(PASS_MARK + name)
     elif status == "FAIL":
-        print(f"{Fore.RED}✗{Style.RESET_ALL} {name}")
+        emit(FAIL_MARK + name)
     elif status == "SKIP":
-        print(f"{Fore.YELLOW}○{Style.RESET_ALL} {name} (skipped)")
+        emit(f"{SKIP_MARK}{name} (skipped)")
     else:
-        print(f"{Fore.BLUE}⟳{Style.RESET_ALL} {name}...")
+        emit(f"{RUNNING_MARK}{name}...")
 
-def check_service_health():
+def check_service_health(session: requests.Session = SESSION) -> bool:
     """Check if the service is healthy"""
     try:
-        response = requests.get(f"http://localhost:8082/actuator/health", timeout=5)
-        return response.status_code == 200
-    except:
+        response = session.get(HEALTH_URL, timeout=2)
+        return 200 <= response.status_code < 300
+    except requests.RequestException:
         return False
 
-def assert_test(condition: bool, test_name: str, error_msg: str = ""):
+def unique_name(prefix: str) -> str:
+    """Build a metric name that is unique within and across test runs"""
+    return f"{prefix}_{RUN_ID}_{next(_name_counter)}"
+
+def wait_for_flush(metric_name: str, session: requests.Session = SESSION, deadline: float = 6.0) -> bool:
+    """Poll until ingested samples for metric_name are queryable or the deadline passes"""
+    probe = {"metricName": metric_name, "limit": 1}
+    delay = 0.1
+    end = time.monotonic() + deadline
+    
+    while True:
+        # Bound each probe by the time left so a stalled request cannot overrun the deadline
+        timeout = max(end - time.monotonic(), 0.1)
+        try:
+            response = session.post(QUERY_URL, json=probe, timeout=timeout)
+            if response.status_code == 200 and len(fast_json(response).get("data", [])) > 0:
+                return True
+        except (requests.RequestException, orjson.JSONDecodeError):
+            # Includes requests.Timeout: a stalled probe simply counts as not ready yet
+            pass
+        
+        remaining = end - time.monotonic()
+        if remaining <= 0:
+            return False
+        time.sleep(min(delay, remaining))
+        delay = min(delay * 2, 0.5)
+
+def fast_json(response: requests.Response) -> Any:
+    """Decode a JSON response body with orjson"""
+    return orjson.loads(response.content)
+
+def post_concurrently(url: str, payloads: List[Dict[str, Any]]) -> List[requests.Response]:
+    """POST each payload to url concurrently and return responses in order"""
+    futures = [EXECUTOR.submit(SESSION.post, url, json=payload) for payload in payloads]
+    return [future.result() for future in futures]
+
+def _run_captured(section, args):
+    """Run a test section with its output collected, returning (result, lines, error)"""
+    _output.lines = lines = []
+    try:
+        return section(*args), lines, None
+    except Exception as e:
+        # A crashed section counts as a failure rather than silently dropping out
+        assert_test(False, f"{section.__name__} completed", f"{type(e).__name__}: {e}")
+        return None, lines, e
+    finally:
+        _output.lines = None
+
+def run_section(section, *args):
+    """Run a test section, writing its buffered output once it finishes"""
+    result, lines, error = _run_captured(section, args)
+    write_lines(lines)
+    if error is not None:
+        raise error
+    return result
+
+def run_concurrently(*sections):
+    """Run independent (section, args) pairs in parallel, printing their output in order"""
+    with ThreadPoolExecutor(max_workers=len(sections)) as pool:
+        futures = [pool.submit(_run_captured, section, args) for section, args in sections]
+        results = [future.result() for future in futures]
+    
+    # Print every section's output before surfacing the first crash
+    for _, lines, _ in results:
+        write_lines(lines)
+    errors = [error for _, _, error in results if error is not None]
+    if errors:
+        raise errors[0]
+
+def assert_test(condition: bool, test_name: str, error_msg: str = "", counters: Counters = COUNTERS):
     """Assert a test condition and track results"""
-    global tests_passed, tests_failed
-    
     if condition:
-        tests_passed += 1
+        with counters.lock:
+            counters.passed += 1
         print_test(test_name, "PASS")
     else:
-        tests_failed += 1
+        with counters.lock:
+            counters.failed += 1
         print_test(test_name, "FAIL")
         if error_msg:
-            print(f"  {Fore.RED}Error: {error_msg}{Style.RESET_ALL}")
+            emit(f"  {Fore.RED}Error: {error_msg}{Style.RESET_ALL}")
     
     return condition
 
@@ -76,7 +234,7 @@ def test_metric_registration():
     
     # Test 1: Register a valid GAUGE metric
     gauge_metric = {
-        "name": f"test_gauge_{int(time.time())}",
+        "name": unique_name("test_gauge"),
         "type": "GAUGE",
         "description": "Test gauge metric",
         "unit": "celsius",
@@ -84,7 +242,7 @@ def test_metric_registration():
         "retentionDays": 30
     }
     
-    response = requests.post(f"{BASE_URL}/metrics/register", json=gauge_metric, headers=HEADERS)
+    response = SESSION.post(REGISTER_URL, json=gauge_metric)
     assert_test(
         response.status_code == 201,
         "Register GAUGE metric",
@@ -93,7 +251,7 @@ def test_metric_registration():
     
     # Test 2: Register a COUNTER metric
     counter_metric = {
-        "name": f"test_counter_{int(time.time())}",
+        "name": unique_name("test_counter"),
         "type": "COUNTER",
         "description": "Test counter metric",
         "unit": "requests",
@@ -101,7 +259,7 @@ def test_metric_registration():
         "retentionDays": 30
     }
     
-    response = requests.post(f"{BASE_URL}/metrics/register", json=counter_metric, headers=HEADERS)
+    response = SESSION.post(REGISTER_URL, json=counter_metric)
     assert_test(
         response.status_code == 201,
         "Register COUNTER metric",
@@ -109,7 +267,7 @@ def test_metric_registration():
     )
     
     # Test 3: Duplicate metric registration (should fail)
-    response = requests.post(f"{BASE_URL}/metrics/register", json=gauge_metric, headers=HEADERS)
+    response = SESSION.post(REGISTER_URL, json=gauge_metric)
     assert_test(
         response.status_code == 409,
         "Reject duplicate metric registration",
@@ -118,12 +276,12 @@ def test_metric_registration():
     
     # Test 4: Invalid metric type
     invalid_metric = {
-        "name": f"test_invalid_{int(time.time())}",
+        "name": unique_name("test_invalid"),
         "type": "INVALID_TYPE",
         "description": "Test invalid metric"
     }
     
-    response = requests.post(f"{BASE_URL}/metrics/register", json=invalid_metric, headers=HEADERS)
+    response = SESSION.post(REGISTER_URL, json=invalid_metric)
     assert_test(
         response.status_code == 400,
         "Reject invalid metric type",
@@ -141,6 +299,9 @@ def test_metric_ingestion(gauge_name: str, counter_name: str):
     print_header("METRIC INGESTION TESTS")
     
     current_time = datetime.now(timezone.utc)
+    now = current_time.isoformat()
+    five_minutes_ago = (current_time - timedelta(minutes=5)).isoformat()
+    ten_minutes_ago = (current_time - timedelta(minutes=10)).isoformat()
     
     # Test 1: Ingest valid gauge metrics
     gauge_data = {
@@ -148,25 +309,24 @@ def test_metric_ingestion(gauge_name: str, counter_name: str):
             {
                 "name": gauge_name,
                 "value": 22.5,
-                "timestamp": current_time.isoformat(),
-                "labels": {"location": "room1", "sensor_id": "s001"}
+                "timestamp": now,
+                "labels": ROOM1_LABELS
             },
             {
                 "name": gauge_name,
                 "value": 23.1,
-                "timestamp": (current_time - timedelta(minutes=5)).isoformat(),
-                "labels": {"location": "room1", "sensor_id": "s001"}
+                "timestamp": five_minutes_ago,
+                "labels": ROOM1_LABELS
             }
         ]
     }
     
-    response = requests.post(f"{BASE_URL}/metrics/ingest", json=gauge_data, headers=HEADERS)
-    result = response.json() if response.status_code in [200, 202] else {}
+    response = SESSION.post(INGEST_URL, json=gauge_data)
     # Service uses async processing, 202 Accepted is valid
     assert_test(
         response.status_code in [200, 202],
         "Ingest valid gauge metrics",
-        f"Status: {response.status_code}, Response: {result}"
+        f"Status: {response.status_code}"
     )
     
     # Test 2: Ingest counter metrics (monotonically increasing)
@@ -175,26 +335,25 @@ def test_metric_ingestion(gauge_name: str, counter_name: str):
             {
                 "name": counter_name,
                 "value": 100,
-                "timestamp": (current_time - timedelta(minutes=10)).isoformat(),
-                "labels": {"endpoint": "/api/users", "status_code": "200"}
+                "timestamp": ten_minutes_ago,
+                "labels": USERS_LABELS
             },
             {
                 "name": counter_name,
                 "value": 150,
-                "timestamp": (current_time - timedelta(minutes=5)).isoformat(),
-                "labels": {"endpoint": "/api/users", "status_code": "200"}
+                "timestamp": five_minutes_ago,
+                "labels": USERS_LABELS
             },
             {
                 "name": counter_name,
                 "value": 200,
-                "timestamp": current_time.isoformat(),
-                "labels": {"endpoint": "/api/users", "status_code": "200"}
+                "timestamp": now,
+                "labels": USERS_LABELS
             }
         ]
     }
     
-    response = requests.post(f"{BASE_URL}/metrics/ingest", json=counter_data, headers=HEADERS)
-    result = response.json() if response.status_code in [200, 202] else {}
+    response = SESSION.post(INGEST_URL, json=counter_data)
     assert_test(
         response.status_code in [200, 202],
         "Ingest counter metrics",
@@ -208,12 +367,12 @@ def test_metric_ingestion(gauge_name: str, counter_name: str):
                 "name": gauge_name,
                 "value": 25.0,
                 "timestamp": (current_time + timedelta(hours=1)).isoformat(),
-                "labels": {"location": "room1", "sensor_id": "s001"}
+                "labels": ROOM1_LABELS
             }
         ]
     }
     
-    response = requests.post(f"{BASE_URL}/metrics/ingest", json=future_data, headers=HEADERS)
+    response = SESSION.post(INGEST_URL, json=future_data)
     # Note: Service uses async processing, validation happens in background
     assert_test(
         response.status_code in [200, 202, 400],
@@ -227,15 +386,15 @@ def test_metric_ingestion(gauge_name: str, counter_name: str):
             {
                 "name": gauge_name,
                 "value": float('nan'),
-                "timestamp": current_time.isoformat(),
-                "labels": {"location": "room1", "sensor_id": "s001"}
+                "timestamp": now,
+                "labels": ROOM1_LABELS
             }
         ]
     }
     
     # Note: NaN might serialize differently, so we check for rejection
     try:
-        response = requests.post(f"{BASE_URL}/metrics/ingest", json=invalid_value_data, headers=HEADERS)
+        response = SESSION.post(INGEST_URL, json=invalid_value_data)
         assert_test(
             response.status_code == 400,
             "Reject NaN values",
@@ -247,7 +406,7 @@ def test_metric_ingestion(gauge_name: str, counter_name: str):
     # Test 5: Empty batch
     empty_data = {"metrics": []}
     
-    response = requests.post(f"{BASE_URL}/metrics/ingest", json=empty_data, headers=HEADERS)
+    response = SESSION.post(INGEST_URL, json=empty_data)
     assert_test(
         response.status_code == 400,
         "Reject empty batch",
@@ -264,7 +423,7 @@ def test_cardinality_protection():
     
     # Register a metric for cardinality testing
     cardinality_metric = {
-        "name": f"test_cardinality_{int(time.time())}",
+        "name": unique_name("test_cardinality"),
         "type": "GAUGE",
         "description": "Test cardinality metric",
         "unit": "units",
@@ -272,13 +431,14 @@ def test_cardinality_protection():
         "retentionDays": 30
     }
     
-    response = requests.post(f"{BASE_URL}/metrics/register", json=cardinality_metric, headers=HEADERS)
+    response = SESSION.post(REGISTER_URL, json=cardinality_metric)
     if response.status_code != 201:
-        print(f"{Fore.YELLOW}Warning: Could not register cardinality test metric{Style.RESET_ALL}")
+        emit(f"{Fore.YELLOW}Warning: Could not register cardinality test metric{Style.RESET_ALL}")
         return
     
     metric_name = cardinality_metric["name"]
     current_time = datetime.now(timezone.utc)
+    now = current_time.isoformat()
     
     # Test 1: Normal cardinality (should succeed)
     normal_data = {
@@ -286,7 +446,7 @@ def test_cardinality_protection():
             {
                 "name": metric_name,
                 "value": 100,
-                "timestamp": current_time.isoformat(),
+                "timestamp": now,
                 "labels": {
                     "environment": "production",
                     "service": "api-gateway",
@@ -297,7 +457,7 @@ def test_cardinality_protection():
         ]
     }
     
-    response = requests.post(f"{BASE_URL}/metrics/ingest", json=normal_data, headers=HEADERS)
+    response = SESSION.post(INGEST_URL, json=normal_data)
     assert_test(
         response.status_code in [200, 202],
         "Accept normal cardinality labels",
@@ -310,13 +470,13 @@ def test_cardinality_protection():
             {
                 "name": metric_name,
                 "value": 100,
-                "timestamp": current_time.isoformat(),
+                "timestamp": now,
                 "labels": {f"label{i}": f"value{i}" for i in range(12)}
             }
         ]
     }
     
-    response = requests.post(f"{BASE_URL}/metrics/ingest", json=too_many_labels, headers=HEADERS)
+    response = SESSION.post(INGEST_URL, json=too_many_labels)
     # Validation happens in background for async processing
     assert_test(
         response.status_code in [200, 202, 400],
@@ -331,7 +491,7 @@ def test_cardinality_protection():
             {
                 "name": metric_name,
                 "value": 100,
-                "timestamp": current_time.isoformat(),
+                "timestamp": now,
                 "labels": {
                     "environment": "production",
                     "service": long_value
@@ -340,7 +500,7 @@ def test_cardinality_protection():
         ]
     }
     
-    response = requests.post(f"{BASE_URL}/metrics/ingest", json=long_label_data, headers=HEADERS)
+    response = SESSION.post(INGEST_URL, json=long_label_data)
     assert_test(
         response.status_code in [200, 202, 400],
         "Handle long label values (>100 chars)",
@@ -348,26 +508,29 @@ def test_cardinality_protection():
     )
     
     # Test 4: High cardinality simulation (many unique user_ids)
-    print(f"{Fore.BLUE}Simulating high cardinality with 50 unique user_ids...{Style.RESET_ALL}")
+    emit(f"{Fore.BLUE}Simulating high cardinality with 50 unique user_ids...{Style.RESET_ALL}")
+    
+    values = [random.uniform(50, 150) for _ in range(50)]
+    timestamps = [(current_time - timedelta(seconds=i)).isoformat() for i in range(50)]
     
-    high_cardinality_metrics = []
-    for i in range(50):
-        high_cardinality_metrics.append({
+    high_cardinality_metrics = [
+        {
             "name": metric_name,
-            "value": random.uniform(50, 150),
-            "timestamp": (current_time - timedelta(seconds=i)).isoformat(),
+            "value": value,
+            "timestamp": timestamp,
             "labels": {
                 "environment": "production",
                 "service": "api-gateway",
                 "endpoint": "/api/users",
                 "user_id": f"user_{i}"
             }
-        })
+        }
+        for i, (value, timestamp) in enumerate(zip(values, timestamps))
+    ]
     
-    response = requests.post(
-        f"{BASE_URL}/metrics/ingest",
-        json={"metrics": high_cardinality_metrics},
-        headers=HEADERS
+    response = SESSION.post(
+        INGEST_URL,
+        data=orjson.dumps({"metrics": high_cardinality_metrics})
     )
     
     # Async processing accepts all initially
@@ -391,6 +554,7 @@ def test_aggregations(metric_name: str):
     
     aggregations = ["SUM", "AVG", "MIN", "MAX", "COUNT", "P50", "P75", "P90", "P95", "P99"]
     
+    queries = []
     for agg in aggregations:
         query = {
             "metricName": metric_name,
@@ -403,8 +567,13 @@ def test_aggregations(metric_name: str):
         if agg in ["SUM", "AVG", "MIN", "MAX", "COUNT"]:
             query["interval"] = "15m"
         
-        response = requests.post(f"{BASE_URL}/metrics/query", json=query, headers=HEADERS)
-        result = response.json() if response.status_code == 200 else {}
+        queries.append((agg, query))
+    
+    # Queries are independent, so send them all at once
+    responses = post_concurrently(QUERY_URL, [query for _, query in queries])
+    
+    for (agg, _), response in zip(queries, responses):
+        result = fast_json(response) if response.status_code == 200 else {}
         
         assert_test(
             response.status_code == 200 and "data" in result,
@@ -413,7 +582,7 @@ def test_aggregations(metric_name: str):
         )
     
     # Test RATE aggregation (should only work for counters)
-    print(f"\n{Fore.BLUE}Testing RATE aggregation...{Style.RESET_ALL}")
+    emit(f"\n{Fore.BLUE}Testing RATE aggregation...{Style.RESET_ALL}")
 
 def test_rate_aggregation(gauge_name: str, counter_name: str):
     """Test RATE aggregation for counters"""
@@ -431,8 +600,8 @@ def test_rate_aggregation(gauge_name: str, counter_name: str):
         "endTime": end_time
     }
     
-    response = requests.post(f"{BASE_URL}/metrics/query", json=counter_query, headers=HEADERS)
-    result = response.json() if response.status_code == 200 else {}
+    response = SESSION.post(QUERY_URL, json=counter_query)
+    result = fast_json(response) if response.status_code == 200 else {}
     assert_test(
         response.status_code == 200 and "data" in result,
         "RATE on COUNTER metric",
@@ -447,8 +616,8 @@ def test_rate_aggregation(gauge_name: str, counter_name: str):
         "endTime": end_time
     }
     
-    response = requests.post(f"{BASE_URL}/metrics/query", json=gauge_query, headers=HEADERS)
-    result = response.json() if response.status_code == 400 else {}
+    response = SESSION.post(QUERY_URL, json=gauge_query)
+    result = fast_json(response) if response.status_code == 400 else {}
     assert_test(
         response.status_code == 400 and "error" in result,
         "Reject RATE on GAUGE metric",
@@ -472,8 +641,8 @@ def test_queries(metric_name: str):
         "endTime": current_time.isoformat()
     }
     
-    response = requests.post(f"{BASE_URL}/metrics/query", json=time_query, headers=HEADERS)
-    result = response.json() if response.status_code == 200 else {}
+    response = SESSION.post(QUERY_URL, json=time_query)
+    result = fast_json(response) if response.status_code == 200 else {}
     assert_test(
         response.status_code == 200 and "data" in result,
         "Query with time range",
@@ -488,7 +657,7 @@ def test_queries(metric_name: str):
         "labels": {"location": "room1"}
     }
     
-    response = requests.post(f"{BASE_URL}/metrics/query", json=label_query, headers=HEADERS)
+    response = SESSION.post(QUERY_URL, json=label_query)
     assert_test(
         response.status_code in [200, 404],  # 404 if no data matches
         "Query with label filters",
@@ -501,8 +670,8 @@ def test_queries(metric_name: str):
         "limit": 5
     }
     
-    response = requests.post(f"{BASE_URL}/metrics/query", json=limit_query, headers=HEADERS)
-    result = response.json() if response.status_code == 200 else {}
+    response = SESSION.post(QUERY_URL, json=limit_query)
+    result = fast_json(response) if response.status_code == 200 else {}
     assert_test(
         response.status_code == 200 and len(result.get("data", [])) <= 5,
         "Query with limit",
@@ -516,7 +685,7 @@ def test_queries(metric_name: str):
         "endTime": current_time.isoformat()
     }
     
-    response = requests.post(f"{BASE_URL}/metrics/query", json=nonexistent_query, headers=HEADERS)
+    response = SESSION.post(QUERY_URL, json=nonexistent_query)
     assert_test(
         response.status_code == 404,
         "Query non-existent metric returns 404",
@@ -534,11 +703,7 @@ def test_edge_cases():
     # Test 1: Invalid JSON
     print_test("Testing invalid JSON", "RUNNING")
     try:
-        response = requests.post(
-            f"{BASE_URL}/metrics/ingest",
-            data="invalid json{",
-            headers={"Content-Type": "application/json"}
-        )
+        response = SESSION.post(INGEST_URL, data=INVALID_JSON_BODY)
         assert_test(
             response.status_code == 400,
             "Reject invalid JSON",
@@ -548,12 +713,7 @@ def test_edge_cases():
         print_test("Reject invalid JSON", "SKIP")
     
     # Test 2: Missing required fields
-    incomplete_metric = {
-        "name": f"incomplete_{int(time.time())}"
-        # Missing type
-    }
-    
-    response = requests.post(f"{BASE_URL}/metrics/register", json=incomplete_metric, headers=HEADERS)
+    response = SESSION.post(REGISTER_URL, data=INCOMPLETE_METRIC_BODY)
     assert_test(
         response.status_code == 400,
         "Reject metric with missing required fields",
@@ -561,13 +721,7 @@ def test_edge_cases():
     )
     
     # Test 3: Invalid metric name format
-    invalid_name_metric = {
-        "name": "123-invalid-name!@#",  # Invalid characters
-        "type": "GAUGE",
-        "description": "Test invalid name"
-    }
-    
-    response = requests.post(f"{BASE_URL}/metrics/register", json=invalid_name_metric, headers=HEADERS)
+    response = SESSION.post(REGISTER_URL, data=INVALID_NAME_METRIC_BODY)
     assert_test(
         response.status_code == 400,
         "Reject invalid metric name format",
@@ -575,14 +729,7 @@ def test_edge_cases():
     )
     
     # Test 4: Metric name too long
-    long_name = "a" * 300  # Over 255 character limit
-    long_name_metric = {
-        "name": long_name,
-        "type": "GAUGE",
-        "description": "Test long name"
-    }
-    
-    response = requests.post(f"{BASE_URL}/metrics/register", json=long_name_metric, headers=HEADERS)
+    response = SESSION.post(REGISTER_URL, data=LONG_NAME_METRIC_BODY)
     assert_test(
         response.status_code == 400,
         "Reject metric name over 255 characters",
@@ -590,10 +737,8 @@ def test_edge_cases():
     )
     
     # Test 5: Invalid time interval format
-    metric_name = f"test_interval_{int(time.time())}"
-    requests.post(f"{BASE_URL}/metrics/register", 
-                  json={"name": metric_name, "type": "GAUGE", "description": "Test"}, 
-                  headers=HEADERS)
+    metric_name = unique_name("test_interval")
+    SESSION.post(REGISTER_URL, json={"name": metric_name, "type": "GAUGE", "description": "Test"})
     
     invalid_interval_query = {
         "metricName": metric_name,
@@ -601,7 +746,7 @@ def test_edge_cases():
         "interval": "invalid"  # Should be like "5m", "1h", etc.
     }
     
-    response = requests.post(f"{BASE_URL}/metrics/query", json=invalid_interval_query, headers=HEADERS)
+    response = SESSION.post(QUERY_URL, json=invalid_interval_query)
     assert_test(
         response.status_code == 400,
         "Reject invalid interval format",
@@ -617,38 +762,64 @@ def test_performance():
     print_header("PERFORMANCE TESTS")
     
     # Test large batch ingestion
-    metric_name = f"test_performance_{int(time.time())}"
-    large_batch = {
-        "metrics": [
-            {
-                "name": "performance_test",
-                "value": float(i),
-                "timestamp": datetime.utcnow().isoformat() + "Z",
-                "labels": {"batch": "large", "index": str(i)},
-                "type": "GAUGE"
-            }
-            for i in range(1000)
-        ]
-    }
-    
-    start = time.time()
-    response = requests.post(f"{BASE_URL}/metrics/ingest", json=large_batch, headers=HEADERS)
-    elapsed = time.time() - start
+    metric_name = unique_name("test_performance")
+    timestamp = datetime.utcnow().isoformat() + "Z"
+    metrics = [
+        {
+            "name": "performance_test",
+            "value": float(i),
+            "timestamp": timestamp,
+            "labels": {"batch": "large", "index": str(i)},
+            "type": "GAUGE"
+        }
+        for i in range(1000)
+    ]
+    
+    # Shard the batch across concurrent requests to exercise the server's async pipeline
+    shard_count = 8
+    shard_size = math.ceil(len(metrics) / shard_count)
+    shards = [
+        orjson.dumps({"metrics": metrics[i:i + shard_size]})
+        for i in range(0, len(metrics), shard_size)
+    ]
+    
+    start = time.perf_counter()
+    futures = [EXECUTOR.submit(SESSION.post, INGEST_URL, data=shard) for shard in shards]
+    statuses = [future.result().status_code for future in futures]
+    elapsed = time.perf_counter() - start
     
     assert_test(
-        response.status_code in [200, 202],
-        f"Large batch ingestion (1000 metrics in {elapsed:.2f}s)",
-        f"Status: {response.status_code} (Async)"
+        all(status in [200, 202] for status in statuses),
+        f"Large batch ingestion ({len(metrics)} metrics in {len(shards)} shards in {elapsed:.2f}s)",
+        f"Statuses: {statuses} (Async)"
     )
 
 def test_archive_operations():
     """Test cold storage archive operations"""
-    print(f"\n{Fore.CYAN}============================================================{Style.RESET_ALL}")
-    print(f"{Fore.CYAN}ARCHIVE OPERATIONS TESTS{Style.RESET_ALL}")
-    print(f"{Fore.CYAN}============================================================{Style.RESET_ALL}")
+    emit(f"\n{Fore.CYAN}============================================================{Style.RESET_ALL}")
+    emit(f"{Fore.CYAN}ARCHIVE OPERATIONS TESTS{Style.RESET_ALL}")
+    emit(f"{Fore.CYAN}============================================================{Style.RESET_ALL}")
+    
+    # Test 2 setup: query archived data (should return empty for now since archival is disabled)
+    # Use a known metric ID from previous tests
+    test_metric_id = "00000000-0000-0000-0000-000000000001"  # Dummy UUID
+    start_time = (datetime.utcnow() - timedelta(days=60)).isoformat() + "Z"
+    end_time = (datetime.utcnow() - timedelta(days=30)).isoformat() + "Z"
+    
+    # Both calls are independent, so issue them concurrently
+    stats_future = EXECUTOR.submit(SESSION.get, ARCHIVE_STATS_URL)
+    query_future = EXECUTOR.submit(
+        SESSION.get,
+        ARCHIVE_QUERY_URL,
+        params={
+            "metricId": test_metric_id,
+            "startTime": start_time,
+            "endTime": end_time
+        }
+    )
     
     # Test 1: Get archival stats
-    response = requests.get(f"{BASE_URL}/archive/stats", headers=HEADERS)
+    response = stats_future.result()
     assert_test(
         response.status_code in [200, 500, 503],  # May be 500/503 if archival is disabled
         "Get archival statistics",
@@ -656,30 +827,17 @@ def test_archive_operations():
     )
     
     if response.status_code == 200:
-        stats = response.json()
+        stats = fast_json(response)
         assert_test(
             "totalRowsArchived" in stats and "totalBytesArchived" in stats,
             "Archival stats contains required fields",
             f"Stats: {stats}"
         )
     else:
-        print(f"  {Fore.YELLOW}Note: Archival service is disabled or unavailable{Style.RESET_ALL}")
+        emit(f"  {Fore.YELLOW}Note: Archival service is disabled or unavailable{Style.RESET_ALL}")
     
-    # Test 2: Query archived data (should return empty for now since archival is disabled)
-    # Use a known metric ID from previous tests
-    test_metric_id = "00000000-0000-0000-0000-000000000001"  # Dummy UUID
-    start_time = (datetime.utcnow() - timedelta(days=60)).isoformat() + "Z"
-    end_time = (datetime.utcnow() - timedelta(days=30)).isoformat() + "Z"
-    
-    response = requests.get(
-        f"{BASE_URL}/archive/query",
-        params={
-            "metricId": test_metric_id,
-            "startTime": start_time,
-            "endTime": end_time
-        },
-        headers=HEADERS
-    )
+    # Test 2: Query archived data
+    response = query_future.result()
     
     # Should return 200 even if no data (archival is disabled by default)
     assert_test(
@@ -690,7 +848,7 @@ def test_archive_operations():
     
     # Test 3: Check trigger endpoint exists (don't actually trigger)
     # Just verify the endpoint is accessible
-    print(f"\n{Fore.YELLOW}Note: Manual archival trigger not tested to avoid long-running job{Style.RESET_ALL}")
+    emit(f"\n{Fore.YELLOW}Note: Manual archival trigger not tested to avoid long-running job{Style.RESET_ALL}")
 
 # ============================================================================
 # MAIN TEST RUNNER
@@ -698,8 +856,6 @@ def test_archive_operations():
 
 def main():
     """Main test runner"""
-    global tests_passed, tests_failed, tests_skipped
-    
     print(f"{Fore.CYAN}{'='*60}")
     print(f"{Fore.CYAN}METRIC STORE COMPREHENSIVE TEST SUITE")
     print(f"{Fore.CYAN}{'='*60}{Style.RESET_ALL}")
@@ -715,35 +871,31 @@ def main():
     # Run all test suites
     try:
         # 1. Registration tests
-        gauge_name, counter_name = test_metric_registration()
+        gauge_name, counter_name = run_section(test_metric_registration)
         
         # 2. Ingestion tests
-        test_metric_ingestion(gauge_name, counter_name)
+        run_section(test_metric_ingestion, gauge_name, counter_name)
         
         # Wait for async processing before querying
-        print(f"\n{Fore.YELLOW}⏳ Waiting 6s for async buffer flush...{Style.RESET_ALL}")
-        time.sleep(6)
+        print(f"\n{Fore.YELLOW}⏳ Waiting up to 6s for async buffer flush...{Style.RESET_ALL}")
+        if not wait_for_flush(gauge_name, SESSION):
+            print(f"{Fore.YELLOW}Warning: Ingested data not visible after 6s, continuing{Style.RESET_ALL}")
         
         # 3. Cardinality protection tests
-        test_cardinality_protection()
-        
-        # 4. Aggregation tests
-        test_aggregations(gauge_name)
+        run_section(test_cardinality_protection)
         
-        # 5. Rate aggregation tests
-        test_rate_aggregation(gauge_name, counter_name)
-        
-        # 6. Query tests
-        test_queries(gauge_name)
-        
-        # 7. Edge cases and validation
-        test_edge_cases()
-        
-        # 8. Performance tests
-        test_performance()
+        # 4-8. Aggregation, rate aggregation, query, edge case and archive tests
+        # only read existing data or touch their own metrics, so run them together
+        run_concurrently(
+            (test_aggregations, (gauge_name,)),
+            (test_rate_aggregation, (gauge_name, counter_name)),
+            (test_queries, (gauge_name,)),
+            (test_edge_cases, ()),
+            (test_archive_operations, ())
+        )
         
-        # 9. Archive operations tests
-        test_archive_operations()
+        # 9. Performance tests (kept on their own so timings are not skewed)
+        run_section(test_performance)
         
     except KeyboardInterrupt:
         print(f"\n{Fore.YELLOW}Test suite interrupted by user{Style.RESET_ALL}")
@@ -755,15 +907,15 @@ def main():
     print(f"{Fore.CYAN}TEST SUMMARY")
     print(f"{Fore.CYAN}{'='*60}{Style.RESET_ALL}")
     
-    total_tests = tests_passed + tests_failed + tests_skipped
+    total_tests = COUNTERS.passed + COUNTERS.failed + COUNTERS.skipped
     
     print(f"Total Tests: {total_tests}")
-    print(f"{Fore.GREEN}Passed: {tests_passed}{Style.RESET_ALL}")
-    print(f"{Fore.RED}Failed: {tests_failed}{Style.RESET_ALL}")
-    if tests_skipped > 0:
-        print(f"{Fore.YELLOW}Skipped: {tests_skipped}{Style.RESET_ALL}")
+    print(f"{Fore.GREEN}Passed: {COUNTERS.passed}{Style.RESET_ALL}")
+    print(f"{Fore.RED}Failed: {COUNTERS.failed}{Style.RESET_ALL}")
+    if COUNTERS.skipped > 0:
+        print(f"{Fore.YELLOW}Skipped: {COUNTERS.skipped}{Style.RESET_ALL}")
     
-    if tests_failed == 0:
+    if COUNTERS.failed == 0:
         print(f"\n{Fore.GREEN}✅ ALL TESTS PASSED!{Style.RESET_ALL}")
         sys.exit(0)
     else: